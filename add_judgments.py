@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Add hand-crafted judgment scenarios to top insights from each episode."""
 
-import json
 from pathlib import Path
 
+from json_utils import read_json, write_json
+
 # Hand-crafted judgment scenarios for top insights (rank 1 from each episode)
 # Keys are unique substrings that appear in the insight text
 JUDGMENT_SCENARIOS = {
@@ -149,8 +150,7 @@ def add_judgments():
     
     input_file = Path("productreps_insights.json")
     
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    data = read_json(input_file)
     
     added_count = 0
     
@@ -168,8 +168,7 @@ def add_judgments():
                 break
     
     # Save the updated file
-    with open(input_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json(input_file, data)
     
     print(f"\n✓ Added {added_count} judgment scenarios to top insights")
     print(f"✓ Saved to {input_file}")
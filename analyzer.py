@@ -4,10 +4,13 @@ Uses Claude API with HARSH criteria for freshness and insights
 Always returns Top 5 non-obvious takeaways with timestamps
 """
 
+import copy
 import json
 import os
 from datetime import datetime
 
+from json_utils import load_json_cached, read_json
+
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
 
@@ -263,9 +266,9 @@ def load_transcript(podcast_id: str) -> str:
 def load_metadata(podcast_id: str) -> dict:
     """Load podcast metadata"""
     try:
-        with open('transcripts_metadata.json', 'r') as f:
-            all_metadata = json.load(f)
-            return all_metadata.get(podcast_id, {})
+        all_metadata = load_json_cached('transcripts_metadata.json')
+        # Copy: the parsed file is shared by every caller
+        return copy.deepcopy(all_metadata.get(podcast_id, {}))
     except:
         return {}
 
@@ -284,8 +287,7 @@ def load_analysis_cache(podcast_id: str) -> dict:
     cache_path = f'cache/{podcast_id}_analysis_critical.json'
     
     if os.path.exists(cache_path):
-        with open(cache_path, 'r') as f:
-            return json.load(f)
+        return read_json(cache_path)
     
     return None
 
@@ -26,10 +26,20 @@ def load_env():
 
 load_env()
 
+# Total seconds an API request may take across all its attempts, so a hung
+# call fails instead of blocking its caller forever. The client retries
+# transient errors, so each attempt gets an equal share of the budget.
+REQUEST_TIMEOUT = 300
+REQUEST_MAX_RETRIES = 2
+
 # Initialize OpenAI client
 try:
     from openai import OpenAI
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = OpenAI(
+        api_key=os.environ.get("OPENAI_API_KEY"),
+        timeout=REQUEST_TIMEOUT / (REQUEST_MAX_RETRIES + 1),
+        max_retries=REQUEST_MAX_RETRIES
+    )
 except ImportError:
     print("❌ OpenAI library not installed. Run: pip3 install openai")
     raise
@@ -9,8 +9,9 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 app = FastAPI(title="Mostly Mid - Podcast Analyzer")
 
@@ -32,23 +33,195 @@ CACHE_DIR = Path("cache")
 TRANSCRIPTS_DIR = Path("transcripts")
 
 
-def load_episodes() -> List[Dict[str, Any]]:
+# Analysis file suffixes, in lookup-preference order (cache/ wins over transcripts/)
+ANALYSIS_SUFFIXES = ("_analysis_critical.json", "_analysis_hybrid.json")
+
+# Large per-episode fields only needed on the detail view
+DETAIL_ONLY_FIELDS = ("top_5_takeaways", "characteristics", "obvious_insights_rejected", "why_these_scores")
+
+
+def find_analysis_files() -> List[Path]:
+    """List analysis files in BOTH cache/ and transcripts/ folders"""
+    analysis_files = []
+    
+    for folder in (CACHE_DIR, TRANSCRIPTS_DIR):
+        if folder.exists():
+            for suffix in ANALYSIS_SUFFIXES:
+                analysis_files.extend(folder.glob(f"*{suffix}"))
+    
+    return analysis_files
+
+
+def _extract_hybrid(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields specific to the NEW HYBRID FORMAT (has "scores" object)"""
+    scores = data["scores"]
+    verdict = data.get("verdict", {})
+    return {
+        "format": "hybrid",
+        
+        # All 6 dimension scores
+        "overall_score": scores["overall"],
+        "insight_density": scores["insight_density"],
+        "signal_to_noise": scores["signal_to_noise"],
+        "actionability": scores["actionability"],
+        "contrarian_index": scores["contrarian_index"],
+        "freshness": scores["freshness"],
+        "host_quality": scores["host_quality"],
+        
+        # Verdict fields
+        "tldr": verdict.get("tldr", ""),
+        "best_for": verdict.get("best_for", ""),
+        "skip_if": verdict.get("skip_if", ""),
+        "worth_it": verdict.get("worth_it", False),
+        "best_quote": verdict.get("best_quote", ""),
+        
+        "why_these_scores": data.get("why_these_scores", {}),
+    }
+
+
+def _extract_old(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields for the OLD CRITICAL FORMAT (flat scores), mapped to the new shape"""
+    freshness_score = data.get("freshness_score", 5)
+    insight_score = data.get("insight_score", 5)
+    return {
+        "format": "old",
+        
+        # Map old format to new
+        "overall_score": (freshness_score + insight_score) / 2,
+        "insight_density": insight_score,
+        "freshness": freshness_score,
+        "signal_to_noise": 5,  # Not in old format
+        "actionability": 5,  # Not in old format
+        "contrarian_index": 5,  # Not in old format
+        "host_quality": 5,  # Not in old format
+        
+        # Old format fields
+        "tldr": data.get("summary", ""),
+        "best_for": "Experienced PMs",  # Generic fallback
+        "skip_if": "",
+        "worth_it": insight_score >= 6,
+        "best_quote": "",
+        
+        "why_these_scores": {},
+    }
+
+
+def build_episode(episode_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Load all episode analyses - looks in BOTH cache/ and transcripts/ folders
+    Build the API episode dict from a parsed analysis file
     Supports BOTH old (critical) and new (hybrid) formats
     """
-    episodes = []
+    # Hybrid format has a "scores" object, old format has flat scores
+    extractor = _extract_hybrid if isinstance(data.get("scores"), dict) else _extract_old
     
-    # Look in BOTH cache/ and transcripts/ folders
-    analysis_files = []
+    takeaways = data.get("top_5_takeaways", [])
+    top_takeaway = takeaways[0] if takeaways else {}
+    
+    return {
+        "id": episode_id,
+        "title": format_title(episode_id),
+        
+        **extractor(data),
+        
+        # Top 5 takeaways
+        "top_5_takeaways": takeaways,
+        "top_insight": top_takeaway.get("insight", ""),
+        "top_insight_timestamp": top_takeaway.get("timestamp", ""),
+        
+        # Count truly non-obvious
+        "truly_non_obvious_count": sum(
+            1 for t in takeaways
+            if t.get("obviousness_level") == "truly_non_obvious"
+        ),
+        
+        # Other fields
+        "summary": data.get("summary", ""),
+        "characteristics": data.get("characteristics", []),
+        "obvious_insights_rejected": data.get("obvious_insights_rejected", []),
+    }
+
+
+# Parsed episodes, reused until an analysis file changes. When the watchdog
+# observer is running, FS events flip "dirty"; otherwise an mtime signature
+# of the analysis files is compared on every load.
+EPISODES_CACHE: Dict[str, Any] = {
+    "watching": False,
+    "dirty": True,
+    "signature": None,
+    "episodes": {},
+}
+
+
+def analysis_files_signature(analysis_files: List[Path]) -> tuple:
+    """Cheap fingerprint of the analysis files (paths + modification times)"""
+    signature = []
+    for analysis_file in analysis_files:
+        try:
+            signature.append((str(analysis_file), analysis_file.stat().st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    return tuple(sorted(signature))
+
+
+def start_cache_watcher():
+    """Invalidate the episodes cache on FS events (inotify on Linux) if watchdog is installed"""
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        print("watchdog not installed, using mtime checks for the episodes cache")
+        return None
+    
+    # A folder created after startup would never be watched, so stay on mtime checks
+    missing = [str(folder) for folder in (CACHE_DIR, TRANSCRIPTS_DIR) if not folder.is_dir()]
+    if missing:
+        print(f"{', '.join(missing)} missing at startup, using mtime checks for the episodes cache")
+        return None
+    
+    class AnalysisChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+            if any(str(path).endswith(".json") for path in paths):
+                EPISODES_CACHE["dirty"] = True
+    
+    observer = Observer()
+    handler = AnalysisChangeHandler()
+    for folder in (CACHE_DIR, TRANSCRIPTS_DIR):
+        observer.schedule(handler, str(folder), recursive=False)
+    observer.daemon = True
+    observer.start()
     
-    if CACHE_DIR.exists():
-        analysis_files.extend(list(CACHE_DIR.glob("*_analysis_critical.json")))
-        analysis_files.extend(list(CACHE_DIR.glob("*_analysis_hybrid.json")))
+    EPISODES_CACHE["dirty"] = True
+    EPISODES_CACHE["watching"] = True
+    return observer
+
+
+def load_episodes(summary_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Load all episode analyses - looks in BOTH cache/ and transcripts/ folders
+    With summary_only, the large detail-only fields are left out (list views)
+    """
+    cached = EPISODES_CACHE["episodes"]
     
-    if TRANSCRIPTS_DIR.exists():
-        analysis_files.extend(list(TRANSCRIPTS_DIR.glob("*_analysis_critical.json")))
-        analysis_files.extend(list(TRANSCRIPTS_DIR.glob("*_analysis_hybrid.json")))
+    if EPISODES_CACHE["watching"]:
+        # Watcher keeps the cache honest - no filesystem access when clean
+        if not EPISODES_CACHE["dirty"] and summary_only in cached:
+            return list(cached[summary_only])
+        # Clear before scanning so events during the scan re-mark it dirty
+        if EPISODES_CACHE["dirty"]:
+            cached.clear()
+            EPISODES_CACHE["dirty"] = False
+        analysis_files = find_analysis_files()
+    else:
+        analysis_files = find_analysis_files()
+        signature = analysis_files_signature(analysis_files)
+        if signature != EPISODES_CACHE["signature"]:
+            cached.clear()
+            EPISODES_CACHE["signature"] = signature
+        elif summary_only in cached:
+            return list(cached[summary_only])
+    
+    episodes = []
     
     print(f"Found {len(analysis_files)} analysis files")
     
@@ -60,87 +233,10 @@ def load_episodes() -> List[Dict[str, Any]]:
             # Extract episode ID
             episode_id = analysis_file.stem.replace("_analysis_critical", "").replace("_analysis_hybrid", "")
             
-            # Check if this is hybrid format (has "scores" object) or old format (has flat scores)
-            is_hybrid = "scores" in data and isinstance(data["scores"], dict)
-            
-            if is_hybrid:
-                # NEW HYBRID FORMAT
-                episode = {
-                    "id": episode_id,
-                    "title": format_title(episode_id),
-                    "format": "hybrid",
-                    
-                    # All 6 dimension scores
-                    "overall_score": data["scores"]["overall"],
-                    "insight_density": data["scores"]["insight_density"],
-                    "signal_to_noise": data["scores"]["signal_to_noise"],
-                    "actionability": data["scores"]["actionability"],
-                    "contrarian_index": data["scores"]["contrarian_index"],
-                    "freshness": data["scores"]["freshness"],
-                    "host_quality": data["scores"]["host_quality"],
-                    
-                    # Verdict fields
-                    "tldr": data.get("verdict", {}).get("tldr", ""),
-                    "best_for": data.get("verdict", {}).get("best_for", ""),
-                    "skip_if": data.get("verdict", {}).get("skip_if", ""),
-                    "worth_it": data.get("verdict", {}).get("worth_it", False),
-                    "best_quote": data.get("verdict", {}).get("best_quote", ""),
-                    
-                    # Top 5 takeaways
-                    "top_5_takeaways": data.get("top_5_takeaways", []),
-                    "top_insight": data.get("top_5_takeaways", [{}])[0].get("insight", "") if data.get("top_5_takeaways") else "",
-                    "top_insight_timestamp": data.get("top_5_takeaways", [{}])[0].get("timestamp", "") if data.get("top_5_takeaways") else "",
-                    
-                    # Count truly non-obvious
-                    "truly_non_obvious_count": sum(
-                        1 for t in data.get("top_5_takeaways", []) 
-                        if t.get("obviousness_level") == "truly_non_obvious"
-                    ),
-                    
-                    # Other fields
-                    "summary": data.get("summary", ""),
-                    "characteristics": data.get("characteristics", []),
-                    "obvious_insights_rejected": data.get("obvious_insights_rejected", []),
-                    "why_these_scores": data.get("why_these_scores", {}),
-                }
-            else:
-                # OLD CRITICAL FORMAT (fallback)
-                episode = {
-                    "id": episode_id,
-                    "title": format_title(episode_id),
-                    "format": "old",
-                    
-                    # Map old format to new
-                    "overall_score": (data.get("freshness_score", 5) + data.get("insight_score", 5)) / 2,
-                    "insight_density": data.get("insight_score", 5),
-                    "freshness": data.get("freshness_score", 5),
-                    "signal_to_noise": 5,  # Not in old format
-                    "actionability": 5,  # Not in old format
-                    "contrarian_index": 5,  # Not in old format
-                    "host_quality": 5,  # Not in old format
-                    
-                    # Old format fields
-                    "tldr": data.get("summary", ""),
-                    "best_for": "Experienced PMs",  # Generic fallback
-                    "skip_if": "",
-                    "worth_it": data.get("insight_score", 5) >= 6,
-                    "best_quote": "",
-                    
-                    # Top 5 from old format
-                    "top_5_takeaways": data.get("top_5_takeaways", []),
-                    "top_insight": data.get("top_5_takeaways", [{}])[0].get("insight", "") if data.get("top_5_takeaways") else "",
-                    "top_insight_timestamp": data.get("top_5_takeaways", [{}])[0].get("timestamp", "") if data.get("top_5_takeaways") else "",
-                    
-                    "truly_non_obvious_count": sum(
-                        1 for t in data.get("top_5_takeaways", []) 
-                        if t.get("obviousness_level") == "truly_non_obvious"
-                    ),
-                    
-                    "summary": data.get("summary", ""),
-                    "characteristics": data.get("characteristics", []),
-                    "obvious_insights_rejected": data.get("obvious_insights_rejected", []),
-                    "why_these_scores": {},
-                }
+            episode = build_episode(episode_id, data)
+            if summary_only:
+                for field in DETAIL_ONLY_FIELDS:
+                    del episode[field]
             
             episodes.append(episode)
             
@@ -160,9 +256,37 @@ def load_episodes() -> List[Dict[str, Any]]:
     # Sort by overall score descending
     unique_episodes.sort(key=lambda x: x["overall_score"], reverse=True)
     
-    return unique_episodes
+    cached[summary_only] = unique_episodes
+    return list(unique_episodes)
 
 
+def load_episodes_index() -> List[Dict[str, Any]]:
+    """Load all episodes without the large detail-only fields"""
+    return load_episodes(summary_only=True)
+
+
+def load_episode_full(episode_id: str) -> Optional[Dict[str, Any]]:
+    """Load full analysis for a single episode, parsing only its own file"""
+    # Episode IDs are bare file stems - never let them escape the folders
+    if not episode_id or Path(episode_id).name != episode_id:
+        return None
+    
+    for folder in (CACHE_DIR, TRANSCRIPTS_DIR):
+        for suffix in ANALYSIS_SUFFIXES:
+            analysis_file = folder / f"{episode_id}{suffix}"
+            if not analysis_file.exists():
+                continue
+            try:
+                with open(analysis_file) as f:
+                    data = json.load(f)
+                return build_episode(episode_id, data)
+            except Exception as e:
+                print(f"Error loading {analysis_file}: {e}")
+    
+    return None
+
+
+@lru_cache(maxsize=4096)
 def format_title(episode_id: str) -> str:
     """Format episode ID into a readable title"""
     title = episode_id.replace("_", " ").title()
@@ -182,59 +306,98 @@ def calculate_stats(episodes: List[Dict]) -> Dict[str, Any]:
             "avg_non_obvious": 0
         }
     
-    scores = [ep["overall_score"] for ep in episodes]
+    # Single pass over episodes instead of one traversal per stat
+    total = len(episodes)
+    score_sum = 0
+    high_quality = 0
+    worth_listening = 0
+    non_obvious_sum = 0
+    for ep in episodes:
+        score = ep["overall_score"]
+        score_sum += score
+        if score >= 7:
+            high_quality += 1
+        if ep.get("worth_it", False):
+            worth_listening += 1
+        non_obvious_sum += ep.get("truly_non_obvious_count", 0)
     
     return {
-        "total": len(episodes),
-        "avg_score": round(sum(scores) / len(scores), 1),
-        "high_quality": sum(1 for s in scores if s >= 7),
-        "worth_listening": sum(1 for ep in episodes if ep.get("worth_it", False)),
-        "avg_non_obvious": round(
-            sum(ep.get("truly_non_obvious_count", 0) for ep in episodes) / len(episodes), 1
-        ) if episodes else 0
+        "total": total,
+        "avg_score": round(score_sum / total, 1),
+        "high_quality": high_quality,
+        "worth_listening": worth_listening,
+        "avg_non_obvious": round(non_obvious_sum / total, 1)
     }
 
 
+# HTML pages are small and static, so read them once at startup
+STATIC_DIR = Path("static")
+HTML_CACHE: Dict[str, bytes] = (
+    {p.name: p.read_bytes() for p in STATIC_DIR.glob("*.html")}
+    if STATIC_DIR.exists() else {}
+)
+HTML_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
 def get_html(filename):
-    """Read HTML file from static directory"""
+    """Get HTML page bytes from the startup cache of the static directory"""
     try:
-        with open(f"static/{filename}", 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
+        return HTML_CACHE[filename]
+    except KeyError:
         raise HTTPException(status_code=404, detail=f"HTML file '{filename}' not found")
 
 
+def html_response(filename) -> HTMLResponse:
+    """Build a browser-cacheable response for a static HTML page"""
+    return HTMLResponse(content=get_html(filename), headers=HTML_HEADERS)
+
+
+@app.on_event("startup")
+def on_startup():
+    """Start watching the analysis folders for changes"""
+    app.state.cache_observer = start_cache_watcher()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Stop the analysis folder watcher"""
+    observer = getattr(app.state, "cache_observer", None)
+    if observer is not None:
+        observer.stop()
+        observer.join(timeout=2)
+
+
 # Routes
 
 @app.get("/", response_class=HTMLResponse)
 def read_root():
     """Serve the landing page"""
-    return get_html("index.html")
+    return html_response("index.html")
 
 
 @app.get("/episodes", response_class=HTMLResponse)
 def episodes_page():
     """Serve the episodes list page"""
-    return get_html("episodes.html")
+    return html_response("episodes.html")
 
 
 @app.get("/episode/{episode_id}", response_class=HTMLResponse)
 def episode_detail_page(episode_id: str):
     """Serve episode detail page"""
-    return get_html("episode.html")
+    return html_response("episode.html")
 
 
 @app.get("/analyze/{podcast_id}", response_class=HTMLResponse)
 def view_analysis_legacy(podcast_id: str):
     """Legacy endpoint"""
-    return get_html("results.html")
+    return html_response("results.html")
 
 
 @app.get("/api/episodes")
 def list_episodes():
     """Get list of all analyzed episodes"""
     try:
-        episodes = load_episodes()
+        episodes = load_episodes_index()
         stats = calculate_stats(episodes)
         
         return {
@@ -250,8 +413,7 @@ def list_episodes():
 def get_episode(episode_id: str):
     """Get detailed data for a specific episode"""
     try:
-        episodes = load_episodes()
-        episode = next((ep for ep in episodes if ep["id"] == episode_id), None)
+        episode = load_episode_full(episode_id)
         
         if not episode:
             raise HTTPException(status_code=404, detail=f"Episode '{episode_id}' not found")
@@ -281,8 +443,7 @@ def analyze_api(podcast_id: str, use_cache: bool = True):
     Get analysis for a podcast (legacy endpoint)
     """
     try:
-        episodes = load_episodes()
-        episode = next((ep for ep in episodes if ep["id"] == podcast_id), None)
+        episode = load_episode_full(podcast_id)
         
         if not episode:
             raise HTTPException(status_code=404, detail=f"Podcast '{podcast_id}' not found")
@@ -298,7 +459,7 @@ def analyze_api(podcast_id: str, use_cache: bool = True):
 @app.get("/api/health")
 def health_check():
     """Health check endpoint"""
-    episodes = load_episodes()
+    episodes = load_episodes_index()
     return {
         "status": "healthy",
         "service": "Mostly Mid API",
@@ -306,9 +467,6 @@ def health_check():
         "episodes_loaded": len(episodes)
     }
 
-@app.route('/episode/<episode_id>')
-def episode_detail(episode_id):
-    return send_from_directory('static', 'episode.html')
 
 if __name__ == "__main__":
     import uvicorn
@@ -316,7 +474,7 @@ if __name__ == "__main__":
     print(f"🎯 Starting Mostly Mid (Hybrid Analyzer) on port {port}")
     print(f"📊 Looking for analyses in: {CACHE_DIR} and {TRANSCRIPTS_DIR}")
     
-    episodes = load_episodes()
+    episodes = load_episodes_index()
     if episodes:
         stats = calculate_stats(episodes)
         print(f"✅ Loaded {stats['total']} episodes")
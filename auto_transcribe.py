@@ -7,6 +7,8 @@ Downloads YouTube audio → Transcribes with Deepgram → Analyzes with hybrid a
 import os
 import sys
 import json
+import shutil
+import hashlib
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -17,7 +19,32 @@ from urllib.parse import urlparse, parse_qs
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 TRANSCRIPTS_DIR = Path("transcripts")
-TEMP_DIR = Path("temp_audio")
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_FREE_BYTES = 1024 ** 3  # Podcasts can be 100MB+ of MP3 plus chunks
+
+
+def pick_temp_dir() -> Path:
+    """
+    Keep temp audio in RAM (tmpfs) when there's room, so download → chunk →
+    upload never touches the real disk. Falls back to ./temp_audio.
+    """
+    override = os.environ.get("AUDIO_TEMP_DIR")
+    if override:
+        return Path(override)
+    
+    try:
+        if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK) \
+                and shutil.disk_usage(SHM_DIR).free >= SHM_MIN_FREE_BYTES:
+            return SHM_DIR / "mostly_mid_audio"
+    except OSError:
+        pass
+    
+    return Path("temp_audio")
+
+
+TEMP_DIR = pick_temp_dir()
+HASH_INDEX_PATH = TRANSCRIPTS_DIR / "_hash_index.json"
+ANALYSIS_TIMEOUT = 300  # 5 minutes (hard kill, subprocess fallback only)
 
 # Ensure directories exist
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
@@ -42,57 +69,60 @@ def get_youtube_id(url: str) -> str:
     raise ValueError(f"Could not extract video ID from URL: {url}")
 
 
-def get_video_metadata(video_id: str) -> dict:
-    """Get video title and metadata using yt-dlp"""
-    try:
-        result = subprocess.run(
-            ['yt-dlp', '--dump-json', '--no-playlist', f'https://www.youtube.com/watch?v={video_id}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        metadata = json.loads(result.stdout)
-        return {
-            'video_id': video_id,
-            'title': metadata.get('title', 'Unknown'),
-            'channel': metadata.get('channel', 'Unknown'),
-            'duration': metadata.get('duration', 0),
-            'upload_date': metadata.get('upload_date', ''),
-            'description': metadata.get('description', '')
-        }
-    except Exception as e:
-        print(f"Warning: Could not fetch metadata: {e}")
-        return {
-            'video_id': video_id,
-            'title': f'Video_{video_id}',
-            'channel': 'Unknown',
-            'duration': 0,
-            'upload_date': '',
-            'description': ''
-        }
+def default_video_metadata(video_id: str) -> dict:
+    """Placeholder metadata used when yt-dlp doesn't report any"""
+    return {
+        'video_id': video_id,
+        'title': f'Video_{video_id}',
+        'channel': 'Unknown',
+        'duration': 0,
+        'upload_date': '',
+        'description': ''
+    }
 
 
-def download_audio(video_id: str, output_path: Path) -> bool:
-    """Download audio from YouTube using yt-dlp"""
+def download_audio(video_id: str, output_path: Path):
+    """
+    Download audio from YouTube using yt-dlp and return the video metadata.
+    Metadata is printed by the same yt-dlp run, so YouTube is only hit once.
+    Returns None if the download fails.
+    """
     print(f"📥 Downloading audio for {video_id}...")
     
     try:
         # Download as MP3 for better compatibility
-        subprocess.run([
+        result = subprocess.run([
             'yt-dlp',
+            '--print', '%(.{title,channel,duration,upload_date,description})j',
+            '--no-simulate',  # --print alone implies --simulate
             '-x',  # Extract audio
             '--audio-format', 'mp3',
             '--audio-quality', '0',  # Best quality
             '-o', str(output_path),
             '--no-playlist',
             f'https://www.youtube.com/watch?v={video_id}'
-        ], check=True, capture_output=True)
-        
-        print(f"✅ Audio downloaded successfully")
-        return True
+        ], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error downloading audio: {e.stderr.decode()}")
-        return False
+        # Output is kept as bytes; only decode it when we actually show it
+        print(f"❌ Error downloading audio: {e.stderr.decode(errors='replace')}")
+        return None
+    
+    print(f"✅ Audio downloaded successfully")
+    
+    try:
+        info = json.loads(result.stdout.strip().splitlines()[0])
+    except (IndexError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not parse metadata: {e}")
+        return default_video_metadata(video_id)
+    
+    return {
+        'video_id': video_id,
+        'title': info.get('title') or 'Unknown',
+        'channel': info.get('channel') or 'Unknown',
+        'duration': info.get('duration') or 0,
+        'upload_date': info.get('upload_date') or '',
+        'description': info.get('description') or ''
+    }
 
 
 def chunk_audio_if_needed(audio_path: Path, max_size_mb: int = 20) -> list:
@@ -124,7 +154,7 @@ def chunk_audio_if_needed(audio_path: Path, max_size_mb: int = 20) -> list:
             "-c", "copy",
             "-loglevel", "error",  # Suppress verbose output
             str(output_pattern)
-        ], check=True, capture_output=True)
+        ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         
         chunks = sorted(audio_path.parent.glob(f"{audio_path.stem}_chunk_*{audio_path.suffix}"))
         print(f"📦 Created {len(chunks)} chunks (~{chunk_duration/60:.0f} min each)")
@@ -278,30 +308,100 @@ def format_transcript(response: dict) -> str:
     return response.get("text", "")
 
 
-def save_transcript(video_id: str, metadata: dict, transcript: str, transcription_response: dict):
-    """Save transcript and metadata to files"""
+def hash_audio(audio_path: Path) -> str:
+    """SHA-256 of the audio file, used to detect already-transcribed audio"""
+    with open(audio_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def load_hash_index() -> dict:
+    """Load the audio hash -> transcript base filename index"""
+    if not HASH_INDEX_PATH.exists():
+        return {}
+    try:
+        with open(HASH_INDEX_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Could not read hash index: {e}")
+        return {}
+
+
+def save_hash_index(index: dict):
+    """Persist the audio hash -> transcript base filename index"""
+    with open(HASH_INDEX_PATH, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+
+
+def make_base_filename(video_id: str, metadata: dict) -> str:
+    """Build the base filename used for all of a video's output files"""
     # Clean filename
     safe_title = "".join(c for c in metadata['title'] if c.isalnum() or c in (' ', '-', '_')).strip()
     safe_title = safe_title.replace(' ', '_')[:50]  # Limit length
     
-    base_filename = f"{video_id}_{safe_title}"
+    return f"{video_id}_{safe_title}"
+
+
+# Separates the metadata header from the transcript body in .txt files
+HEADER_SEPARATOR = "\n" + "="*80 + "\n\n"
+
+
+def format_transcript_header(video_id: str, metadata: dict, transcription_response: dict) -> str:
+    """Metadata header (ending with HEADER_SEPARATOR) written above a transcript"""
+    header = (
+        f"Title: {metadata['title']}\n"
+        f"Channel: {metadata['channel']}\n"
+        f"Duration: {metadata['duration']} seconds\n"
+        f"URL: https://www.youtube.com/watch?v={video_id}\n"
+        f"Transcribed: {datetime.now().isoformat()}\n"
+        f"Service: OpenAI Whisper API\n"
+    )
+    
+    # Add cost info if available
+    if 'metadata' in transcription_response and 'estimated_cost' in transcription_response['metadata']:
+        cost = transcription_response['metadata']['estimated_cost']
+        header += f"Cost: ${cost:.2f}\n"
+    
+    return header + HEADER_SEPARATOR
+
+
+def reuse_transcript(existing_base: str, video_id: str, metadata: dict):
+    """Point a new video at an existing transcript with identical audio"""
+    base_filename = make_base_filename(video_id, metadata)
+    transcript_path = TRANSCRIPTS_DIR / f"{base_filename}.txt"
+    
+    if base_filename != existing_base:
+        # Same audio, different video: keep the body, but the header must
+        # describe this video, not the one first transcribed
+        existing_text = (TRANSCRIPTS_DIR / f"{existing_base}.txt").read_text(encoding='utf-8')
+        _, separator, body = existing_text.partition(HEADER_SEPARATOR)
+        if not separator:
+            body = existing_text
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            # No new Whisper cost was incurred for this copy
+            f.write(format_transcript_header(video_id, metadata, {}))
+            f.write(body)
+        
+        existing_whisper = TRANSCRIPTS_DIR / f"{existing_base}_whisper.json"
+        if existing_whisper.exists():
+            shutil.copyfile(existing_whisper, TRANSCRIPTS_DIR / f"{base_filename}_whisper.json")
+        
+        metadata_path = TRANSCRIPTS_DIR / f"{base_filename}_metadata.json"
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+    
+    print(f"♻️  Audio already transcribed as {existing_base}, skipping Whisper")
+    print(f"💾 Transcript at: {transcript_path}")
+    return transcript_path, base_filename
+
+
+def save_transcript(video_id: str, metadata: dict, transcript: str, transcription_response: dict):
+    """Save transcript and metadata to files"""
+    base_filename = make_base_filename(video_id, metadata)
     
     # Save transcript as .txt
     transcript_path = TRANSCRIPTS_DIR / f"{base_filename}.txt"
     with open(transcript_path, 'w', encoding='utf-8') as f:
-        f.write(f"Title: {metadata['title']}\n")
-        f.write(f"Channel: {metadata['channel']}\n")
-        f.write(f"Duration: {metadata['duration']} seconds\n")
-        f.write(f"URL: https://www.youtube.com/watch?v={video_id}\n")
-        f.write(f"Transcribed: {datetime.now().isoformat()}\n")
-        f.write(f"Service: OpenAI Whisper API\n")
-        
-        # Add cost info if available
-        if 'metadata' in transcription_response and 'estimated_cost' in transcription_response['metadata']:
-            cost = transcription_response['metadata']['estimated_cost']
-            f.write(f"Cost: ${cost:.2f}\n")
-        
-        f.write("\n" + "="*80 + "\n\n")
+        f.write(format_transcript_header(video_id, metadata, transcription_response))
         f.write(transcript)
     
     # Save full Whisper response for future reference
@@ -318,6 +418,20 @@ def save_transcript(video_id: str, metadata: dict, transcript: str, transcriptio
     return transcript_path, base_filename
 
 
+def run_analysis_subprocess(transcript_path: Path) -> bool:
+    """Fallback: run analyzer_hybrid.py in a separate interpreter"""
+    result = subprocess.run([
+        sys.executable,
+        'analyzer_hybrid.py',
+        str(transcript_path)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=ANALYSIS_TIMEOUT)
+    
+    if result.returncode != 0:
+        print(f"⚠️  Analysis failed: {result.stderr.decode(errors='replace')}")
+        return False
+    return True
+
+
 def run_analysis(transcript_path: Path, base_filename: str):
     """Run the hybrid analyzer on the transcript"""
     print(f"🧠 Running hybrid analyzer...")
@@ -328,23 +442,32 @@ def run_analysis(transcript_path: Path, base_filename: str):
             print("⚠️  analyzer_hybrid.py not found, skipping analysis")
             return False
         
-        result = subprocess.run([
-            sys.executable,
-            'analyzer_hybrid.py',
-            str(transcript_path)
-        ], capture_output=True, text=True, timeout=300)
+        try:
+            # Only the first call actually imports: that loads analyzer_hybrid's
+            # .env into os.environ and builds its OpenAI client, the setup the
+            # analyzer subprocess used to repeat for every episode
+            from analyzer_hybrid import analyze_and_save
+        except ImportError:
+            analyze_and_save = None
         
-        if result.returncode == 0:
-            print(f"✅ Analysis complete")
-            analysis_file = TRANSCRIPTS_DIR / f"{base_filename}_analysis_hybrid.json"
-            if analysis_file.exists():
-                print(f"💾 Analysis saved to: {analysis_file}")
-                return True
-            else:
-                print("⚠️  Analysis completed but file not found")
+        if analyze_and_save is None:
+            if not run_analysis_subprocess(transcript_path):
                 return False
         else:
-            print(f"⚠️  Analysis failed: {result.stderr}")
+            # Run in-process to skip interpreter startup and re-imports per
+            # episode. A hung API request can't be killed from here; it is
+            # bounded by analyzer_hybrid.REQUEST_TIMEOUT across all retries
+            # (plus the client's backoff between them) and raises like any
+            # other error.
+            analyze_and_save(str(transcript_path))
+        
+        print(f"✅ Analysis complete")
+        analysis_file = TRANSCRIPTS_DIR / f"{base_filename}_analysis_hybrid.json"
+        if analysis_file.exists():
+            print(f"💾 Analysis saved to: {analysis_file}")
+            return True
+        else:
+            print("⚠️  Analysis completed but file not found")
             return False
             
     except subprocess.TimeoutExpired:
@@ -362,39 +485,51 @@ def process_youtube_url(youtube_url: str, skip_analysis: bool = False) -> bool:
     print(f"🎬 Processing: {youtube_url}")
     print(f"{'='*80}\n")
     
+    audio_path = None
     try:
         # Step 1: Extract video ID
         video_id = get_youtube_id(youtube_url)
         print(f"📹 Video ID: {video_id}")
         
-        # Step 2: Get metadata
-        metadata = get_video_metadata(video_id)
-        print(f"📝 Title: {metadata['title']}")
-        print(f"👤 Channel: {metadata['channel']}")
-        print(f"⏱️  Duration: {metadata['duration']/60:.1f} minutes")
-        
-        # Step 3: Download audio
+        # Step 2: Download audio (metadata comes back from the same yt-dlp run)
         audio_path = TEMP_DIR / f"{video_id}.mp3"
-        if not download_audio(video_id, audio_path):
+        metadata = download_audio(video_id, audio_path)
+        if metadata is None:
             return False
         
-        # Step 4: Transcribe
-        whisper_response = transcribe_with_whisper_api(audio_path, OPENAI_API_KEY)
-        if not whisper_response:
-            return False
-        
-        transcript = format_transcript(whisper_response)
-        
-        if not transcript:
-            print("❌ Failed to extract transcript from Deepgram response")
-            return False
+        # Step 3: Show metadata
+        print(f"📝 Title: {metadata['title']}")
+        print(f"👤 Channel: {metadata['channel']}")
+        print(f"⏱️  Duration: {metadata['duration']/60:.1f} minutes")
         
-        print(f"📄 Transcript length: {len(transcript)} characters")
+        # Step 4: Skip Whisper if this exact audio was already transcribed
+        audio_hash = hash_audio(audio_path)
+        hash_index = load_hash_index()
+        existing_base = hash_index.get(audio_hash)
         
-        # Step 5: Save transcript
-        transcript_path, base_filename = save_transcript(
-            video_id, metadata, transcript, whisper_response
-        )
+        if existing_base and (TRANSCRIPTS_DIR / f"{existing_base}.txt").exists():
+            transcript_path, base_filename = reuse_transcript(existing_base, video_id, metadata)
+        else:
+            # Step 4b: Transcribe
+            whisper_response = transcribe_with_whisper_api(audio_path, OPENAI_API_KEY)
+            if not whisper_response:
+                return False
+            
+            transcript = format_transcript(whisper_response)
+            
+            if not transcript:
+                print("❌ Failed to extract transcript from Deepgram response")
+                return False
+            
+            print(f"📄 Transcript length: {len(transcript)} characters")
+            
+            # Step 5: Save transcript
+            transcript_path, base_filename = save_transcript(
+                video_id, metadata, transcript, whisper_response
+            )
+            
+            hash_index[audio_hash] = base_filename
+            save_hash_index(hash_index)
         
         # Step 6: Run analysis (optional)
         if not skip_analysis:
@@ -402,11 +537,6 @@ def process_youtube_url(youtube_url: str, skip_analysis: bool = False) -> bool:
         else:
             print("⏭️  Skipping analysis (use --analyze flag to enable)")
         
-        # Cleanup
-        if audio_path.exists():
-            audio_path.unlink()
-            print(f"🗑️  Cleaned up temp audio file")
-        
         print(f"\n✅ Successfully processed: {metadata['title']}")
         return True
         
@@ -415,6 +545,16 @@ def process_youtube_url(youtube_url: str, skip_analysis: bool = False) -> bool:
         import traceback
         traceback.print_exc()
         return False
+    
+    finally:
+        # Cleanup on every path: TEMP_DIR may be tmpfs, where leftover audio
+        # (and chunks from a failed transcription) would hold RAM until reboot
+        if audio_path is not None:
+            for chunk_path in audio_path.parent.glob(f"{audio_path.stem}_chunk_*{audio_path.suffix}"):
+                chunk_path.unlink(missing_ok=True)
+            if audio_path.exists():
+                audio_path.unlink(missing_ok=True)
+                print(f"🗑️  Cleaned up temp audio file")
 
 
 def batch_process(urls_file: Path, skip_analysis: bool = False):
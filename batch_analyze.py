@@ -6,7 +6,64 @@ Run this locally before deploying to avoid API costs in production
 
 import os
 import json
-from analyzer import analyze_podcast, load_metadata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from analyzer import analyze_podcast, load_analysis_cache
+from json_utils import read_json, write_json
+
+MAX_WORKERS = 8  # Concurrent Anthropic requests, capped to stay clear of rate limits
+
+CACHE_DIR = "cache"
+CACHE_SUFFIX = "_analysis_critical.json"
+
+
+def load_all_metadata() -> dict:
+    """Load transcripts_metadata.json once for every podcast in the batch"""
+    try:
+        return read_json('transcripts_metadata.json')
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def find_cached_ids() -> set:
+    """Podcast IDs that already have a cached analysis"""
+    if not os.path.isdir(CACHE_DIR):
+        return set()
+    with os.scandir(CACHE_DIR) as entries:
+        return {entry.name[:-len(CACHE_SUFFIX)] for entry in entries if entry.name.endswith(CACHE_SUFFIX)}
+
+
+def analyze_one(podcast_id: str, all_metadata: dict, cached_ids: set) -> dict:
+    """Analyze a single podcast (uses cache if exists) and build its summary row"""
+    # Already analyzed: read the cache file once and skip analyze_podcast's
+    # own cache lookup + metadata load
+    analysis = load_analysis_cache(podcast_id) if podcast_id in cached_ids else None
+    if not analysis:
+        analysis = analyze_podcast(podcast_id, use_cache=True)
+    
+    # Get metadata for display
+    metadata = all_metadata.get(podcast_id, {})
+    title = metadata.get('title', podcast_id)
+    
+    print(f"✓ [{podcast_id}] {title}")
+    print(f"  [{podcast_id}] Freshness: {analysis.get('freshness_score')}/10")
+    print(f"  [{podcast_id}] Insights: {analysis.get('insight_score')}/10")
+    
+    return {
+        'id': podcast_id,
+        'title': title,
+        'freshness': analysis.get('freshness_score'),
+        'insights': analysis.get('insight_score'),
+        'cached': True
+    }
+
+
+def iter_podcast_ids(transcript_dir: str):
+    """Yield podcast IDs for each .txt transcript in transcript_dir"""
+    with os.scandir(transcript_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.txt') and entry.is_file():
+                yield entry.name[:-len('.txt')]
+
 
 def batch_analyze_all_podcasts():
     """Analyze all podcasts found in transcripts/ directory"""
@@ -18,45 +75,36 @@ def batch_analyze_all_podcasts():
         print(f"❌ {transcript_dir} directory not found!")
         return
     
-    # Get all .txt files
-    transcript_files = [f for f in os.listdir(transcript_dir) if f.endswith('.txt')]
-    podcast_ids = [f.replace('.txt', '') for f in transcript_files]
+    # Get all .txt files (scandir entries know their type, no extra stat)
+    podcast_ids = list(iter_podcast_ids(transcript_dir))
     
     print(f"📊 Found {len(podcast_ids)} podcasts to analyze")
     print("=" * 60)
     
-    results = []
+    results_by_id = {}
+    all_metadata = load_all_metadata()
+    cached_ids = find_cached_ids()
     
-    for i, podcast_id in enumerate(podcast_ids, 1):
-        print(f"\n[{i}/{len(podcast_ids)}] Analyzing: {podcast_id}")
-        print("-" * 60)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(analyze_one, podcast_id, all_metadata, cached_ids): podcast_id
+            for podcast_id in podcast_ids
+        }
         
-        try:
-            # Analyze (will use cache if exists)
-            analysis = analyze_podcast(podcast_id, use_cache=True)
-            
-            # Get metadata for display
-            metadata = load_metadata(podcast_id)
-            title = metadata.get('title', podcast_id)
-            
-            results.append({
-                'id': podcast_id,
-                'title': title,
-                'freshness': analysis.get('freshness_score'),
-                'insights': analysis.get('insight_score'),
-                'cached': True
-            })
-            
-            print(f"✓ {title}")
-            print(f"  Freshness: {analysis.get('freshness_score')}/10")
-            print(f"  Insights: {analysis.get('insight_score')}/10")
-            
-        except Exception as e:
-            print(f"❌ Error analyzing {podcast_id}: {e}")
-            results.append({
-                'id': podcast_id,
-                'error': str(e)
-            })
+        for i, future in enumerate(as_completed(futures), 1):
+            podcast_id = futures[future]
+            try:
+                results_by_id[podcast_id] = future.result()
+            except Exception as e:
+                print(f"❌ Error analyzing {podcast_id}: {e}")
+                results_by_id[podcast_id] = {
+                    'id': podcast_id,
+                    'error': str(e)
+                }
+            print(f"[{i}/{len(podcast_ids)}] Done: {podcast_id}")
+    
+    # Keep the summary in directory order regardless of completion order
+    results = [results_by_id[podcast_id] for podcast_id in podcast_ids]
     
     # Summary
     print("\n" + "=" * 60)
@@ -77,8 +125,7 @@ def batch_analyze_all_podcasts():
         print(f"  Insights: {avg_insights:.1f}/10")
     
     # Save summary
-    with open('cache/batch_summary.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    write_json('cache/batch_summary.json', results)
     
     print(f"\n💾 Summary saved to cache/batch_summary.json")
     print("\n🚀 Ready to deploy! Run: git add cache/ && git commit -m 'Add cached analyses' && git push")
@@ -4,73 +4,62 @@ Batch analyze existing transcript files that don't have analysis yet
 Useful after you've transcribed many episodes and want to analyze them all
 """
 
-import subprocess
-import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 TRANSCRIPTS_DIR = Path("transcripts")
+MAX_WORKERS = 8  # Transcripts analyzed at once
+ANALYSIS_SUFFIXES = ("_analysis_hybrid.json", "_analysis_v2.json", "_analysis_critical.json")
 
 
 def find_unanalyzed_transcripts():
     """Find .txt transcripts that don't have corresponding *_analysis_hybrid.json"""
-    txt_files = list(TRANSCRIPTS_DIR.glob("*.txt"))
-    unanalyzed = []
+    if not TRANSCRIPTS_DIR.is_dir():
+        return []
     
-    for txt_file in txt_files:
-        # Check various analysis file patterns
-        base_name = txt_file.stem
-        
-        possible_analysis_files = [
-            TRANSCRIPTS_DIR / f"{base_name}_analysis_hybrid.json",
-            TRANSCRIPTS_DIR / f"{base_name}_analysis_v2.json",
-            TRANSCRIPTS_DIR / f"{base_name}_analysis_critical.json",
-        ]
-        
-        # If none exist, this transcript needs analysis
-        if not any(f.exists() for f in possible_analysis_files):
-            unanalyzed.append(txt_file)
+    # One directory scan; everything after is string/set work instead of stat calls
+    with os.scandir(TRANSCRIPTS_DIR) as entries:
+        names = {entry.name for entry in entries if entry.is_file()}
     
-    return unanalyzed
+    # Base names that already have any of the analysis file patterns
+    analyzed_bases = {
+        name[:-len(suffix)]
+        for name in names if name.endswith(ANALYSIS_SUFFIXES)
+        for suffix in ANALYSIS_SUFFIXES if name.endswith(suffix)
+    }
+    
+    # If none exist, this transcript needs analysis
+    return [
+        TRANSCRIPTS_DIR / name
+        for name in sorted(names)
+        if name.endswith('.txt') and name[:-len('.txt')] not in analyzed_bases
+    ]
 
 
 def analyze_transcript(txt_file: Path) -> bool:
-    """Run analyzer on a single transcript"""
+    """Run analyzer on a single transcript (in-process, no interpreter per file)"""
     print(f"\n{'='*80}")
     print(f"🧠 Analyzing: {txt_file.name}")
     print(f"{'='*80}\n")
     
     try:
-        result = subprocess.run(
-            [sys.executable, 'analyzer_hybrid.py', str(txt_file)],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if result.returncode == 0:
-            print(f"✅ Analysis complete")
-            return True
-        else:
-            print(f"❌ Analysis failed:")
-            print(result.stderr)
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print(f"⏱️  Analysis timed out (>5 minutes)")
-        return False
+        # Imported here, not at module level: analyzer_hybrid loads .env and
+        # creates its API client on import, which shouldn't happen (or fail)
+        # unless something actually needs analysis. Hung requests are bounded
+        # by analyzer_hybrid.REQUEST_TIMEOUT across all retries (plus retry
+        # backoff) and fail like any other error.
+        from analyzer_hybrid import analyze_and_save
+        analyze_and_save(str(txt_file))
+        print(f"✅ Analysis complete: {txt_file.name}")
+        return True
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error ({txt_file.name}): {e}")
         return False
 
 
 def main():
-    # Check if analyzer exists
-    if not Path("analyzer_hybrid.py").exists():
-        print("❌ Error: analyzer_hybrid.py not found")
-        print("Make sure you're running this from the project root")
-        sys.exit(1)
-    
     # Find unanalyzed transcripts
     unanalyzed = find_unanalyzed_transcripts()
     
@@ -94,10 +83,13 @@ def main():
     results = []
     start_time = datetime.now()
     
-    for i, txt_file in enumerate(unanalyzed, 1):
-        print(f"\n[{i}/{len(unanalyzed)}]")
-        success = analyze_transcript(txt_file)
-        results.append({'file': txt_file.name, 'success': success})
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(unanalyzed))) as executor:
+        futures = [(txt_file, executor.submit(analyze_transcript, txt_file)) for txt_file in unanalyzed]
+        
+        for i, (txt_file, future) in enumerate(futures, 1):
+            success = future.result()
+            print(f"\n[{i}/{len(unanalyzed)}] {'✅' if success else '❌'} {txt_file.name}")
+            results.append({'file': txt_file.name, 'success': success})
     
     # Summary
     end_time = datetime.now()
@@ -1,22 +1,33 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
 
 transcript_dir = "transcripts"
 
-for filename in os.listdir(transcript_dir):
-    if filename.endswith('.docx'):
-        docx_path = os.path.join(transcript_dir, filename)
-        txt_filename = filename.replace('.docx', '.txt')
-        txt_path = os.path.join(transcript_dir, txt_filename)
-        
-        # Extract text from docx
-        doc = Document(docx_path)
-        text = '\n'.join([para.text for para in doc.paragraphs])
-        
-        # Save as txt
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write(text)
-        
-        print(f"✓ Converted: {filename} → {txt_filename}")
-
-print("\n✓ All .docx files converted to .txt")
+
+def convert_one(filename):
+    """Convert a single .docx transcript to .txt (runs in a worker process)"""
+    docx_path = os.path.join(transcript_dir, filename)
+    txt_filename = filename.replace('.docx', '.txt')
+    txt_path = os.path.join(transcript_dir, txt_filename)
+
+    # Extract text from docx
+    doc = Document(docx_path)
+    text = '\n'.join([para.text for para in doc.paragraphs])
+
+    # Save as txt
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    print(f"✓ Converted: {filename} → {txt_filename}")
+    return txt_path
+
+
+if __name__ == "__main__":
+    docx_files = [f for f in os.listdir(transcript_dir) if f.endswith('.docx')]
+
+    # docx XML parsing is CPU-bound, so use processes (one per core) not threads
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(convert_one, docx_files, chunksize=4))
+
+    print("\n✓ All .docx files converted to .txt")
@@ -4,25 +4,38 @@ Generate metadata for all cached podcasts
 """
 
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+
+from json_utils import read_json, write_json
+
+# Reads are I/O-bound (and slow on network filesystems), so overlap them
+LOAD_WORKERS = 32
+
 
 def create_metadata():
     cache_dir = "cache"
     transcripts_dir = "transcripts"
     
     # Get all cached analyses
-    cache_files = [f for f in os.listdir(cache_dir) if f.endswith('_analysis_critical.json')]
+    with os.scandir(cache_dir) as entries:
+        cache_files = [
+            entry.name for entry in entries
+            if entry.name.endswith('_analysis_critical.json') and entry.is_file()
+        ]
     
     metadata = {}
     
-    for cache_file in cache_files:
+    # Load all the analyses concurrently
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        analyses = list(executor.map(
+            read_json,
+            [os.path.join(cache_dir, cache_file) for cache_file in cache_files]
+        ))
+    
+    for cache_file, analysis in zip(cache_files, analyses):
         # Extract podcast ID from filename
         podcast_id = cache_file.replace('_analysis_critical.json', '')
         
-        # Load the analysis
-        with open(os.path.join(cache_dir, cache_file), 'r') as f:
-            analysis = json.load(f)
-        
         # Create a readable title from podcast_id
         title = podcast_id.replace('_', ' ')
         # Capitalize first letter of each major word, but keep small words lowercase
@@ -46,8 +59,7 @@ def create_metadata():
         }
     
     # Save metadata
-    with open('transcripts_metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=2)
+    write_json('transcripts_metadata.json', metadata)
     
     print(f"✓ Created metadata for {len(metadata)} podcasts")
     print(f"💾 Saved to transcripts_metadata.json")
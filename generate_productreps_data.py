@@ -6,18 +6,26 @@ Updated to support 15-20 insights per episode with category classification.
 Usage:
   python generate_productreps_data.py              # Without AI challenge scenarios (fast)
   python generate_productreps_data.py --with-ai    # With AI challenge scenarios (requires OPENAI_API_KEY)
+  python generate_productreps_data.py --with-ai --batch-api  # Same, via OpenAI Batch API (50% cheaper, slower)
   
 Environment:
   OPENAI_API_KEY - Required for --with-ai mode (loads from .env file)
 """
 
+import asyncio
 import json
 import os
 import sys
+import time
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+from json_utils import read_json, write_json
+
 # Load environment variables from .env file
 def load_env():
     """Load environment variables from .env file if it exists."""
@@ -48,9 +56,21 @@ if GENERATE_AI_CHALLENGES:
 else:
     print("ℹ Running without AI challenge generation (use --with-ai to enable)")
 
+# Submit all challenge prompts as one OpenAI Batch API job instead of live calls
+USE_BATCH_API = GENERATE_AI_CHALLENGES and "--batch-api" in sys.argv
+BATCH_POLL_SECONDS = 30
+CHALLENGE_MODEL = "gpt-4o"
+
 TRANSCRIPTS_DIR = Path("transcripts")
 OUTPUT_FILE = Path("productreps_insights.json")
 
+# File reads are I/O-bound and go through a thread pool
+LOAD_WORKERS = 16
+# Live challenge calls run on one event loop; this caps requests in flight
+CHALLENGE_CONCURRENCY = 50
+# Thread pool size when the async OpenAI client is unavailable
+CHALLENGE_WORKERS = 16
+
 # Valid categories
 VALID_CATEGORIES = [
     "learn_from_legends",
@@ -77,6 +97,18 @@ def extract_metadata_from_analysis(data: dict, filename: str) -> dict:
         }
     
     # Fallback: Extract from filename (old format)
+    podcast, episode, guest = _parse_filename(filename)
+    return {
+        "podcast": podcast,
+        "episode": episode,
+        "guest": guest,
+        "category": "learn_from_legends"
+    }
+
+
+@lru_cache(maxsize=None)
+def _parse_filename(filename: str) -> tuple:
+    """Infer (podcast, episode, guest) from an analysis filename."""
     name = filename.replace("_analysis_hybrid.json", "")
     
     # Common patterns: "Title _ Guest Name" or "Guest Name _ Title"
@@ -87,28 +119,15 @@ def extract_metadata_from_analysis(data: dict, filename: str) -> dict:
             guest_part = parts[-1].strip()
             guest_clean = guest_part.split("(")[0].strip()
             
-            return {
-                "podcast": "Lenny's Podcast",  # Default for old files
-                "episode": title_part,
-                "guest": guest_clean,
-                "category": "learn_from_legends"
-            }
+            return ("Lenny's Podcast", title_part, guest_clean)  # Default podcast for old files
     
-    return {
-        "podcast": "Unknown Podcast",
-        "episode": name,
-        "guest": "Unknown Guest",
-        "category": "learn_from_legends"
-    }
+    return ("Unknown Podcast", name, "Unknown Guest")
 
 
-def generate_challenge_scenario(insight: dict, guest: str, context: str) -> dict:
-    """Use OpenAI to generate a challenge scenario from an insight."""
-    
-    if not GENERATE_AI_CHALLENGES or client is None:
-        return None
+def build_challenge_prompt(insight: dict, guest: str, context: str) -> str:
+    """Build the prompt asking for a challenge scenario from an insight."""
     
-    prompt = f"""Based on this product insight, create a challenge scenario for product managers.
+    return f"""Based on this product insight, create a challenge scenario for product managers.
 
 INSIGHT: {insight.get('insight', '')}
 WHY VALUABLE: {insight.get('why_valuable', '')}
@@ -133,29 +152,73 @@ Respond in this exact JSON format:
 
 Only respond with valid JSON, no other text."""
 
+
+def parse_challenge_response(response_text: str) -> dict:
+    """Parse the JSON challenge scenario out of a model response."""
+    # Handle markdown code blocks if present
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    
+    return json.loads(response_text)
+
+
+def generate_challenge_scenario(insight: dict, guest: str, context: str) -> dict:
+    """Use OpenAI to generate a challenge scenario from an insight."""
+    
+    if not GENERATE_AI_CHALLENGES or client is None:
+        return None
+    
+    prompt = build_challenge_prompt(insight, guest, context)
+
     try:
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=CHALLENGE_MODEL,
             max_tokens=500,
             temperature=0.7,
             messages=[{"role": "user", "content": prompt}]
         )
         
-        response_text = response.choices[0].message.content
-        
-        # Handle markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+        return parse_challenge_response(response.choices[0].message.content)
+    except Exception as e:
+        print(f"    Warning: Could not generate challenge scenario: {e}")
+        return None
+
+
+async def generate_challenge_scenario_async(aclient, semaphore: asyncio.Semaphore,
+                                           insight: dict, guest: str, context: str) -> dict:
+    """Async version of generate_challenge_scenario, limited by semaphore."""
+    prompt = build_challenge_prompt(insight, guest, context)
+    
+    try:
+        async with semaphore:
+            response = await aclient.chat.completions.create(
+                model=CHALLENGE_MODEL,
+                max_tokens=500,
+                temperature=0.7,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
-        result = json.loads(response_text)
-        return result
+        return parse_challenge_response(response.choices[0].message.content)
     except Exception as e:
         print(f"    Warning: Could not generate challenge scenario: {e}")
         return None
 
 
+async def run_challenge_jobs(challenge_jobs: list) -> list:
+    """Generate challenge scenarios for all jobs concurrently, in job order."""
+    from openai import AsyncOpenAI
+    
+    semaphore = asyncio.Semaphore(CHALLENGE_CONCURRENCY)
+    async with AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY")) as aclient:
+        return await asyncio.gather(*(
+            generate_challenge_scenario_async(aclient, semaphore, takeaway, guest, summary)
+            for _, takeaway, guest, summary in challenge_jobs
+        ))
+
+
+@lru_cache(maxsize=None)
 def obviousness_to_spicy(level: str) -> int:
     """Convert obviousness level to spicy rating."""
     mapping = {
@@ -166,14 +229,55 @@ def obviousness_to_spicy(level: str) -> int:
     return mapping.get(level, 2)
 
 
-def process_analysis_file(filepath: Path) -> list[dict]:
+def new_card_ids(count: int) -> list[str]:
+    """Generate count random (version 4) UUID strings from a single urandom call."""
+    random_bytes = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=random_bytes[i * 16:(i + 1) * 16], version=4))
+        for i in range(count)
+    ]
+
+
+def new_insight_stats() -> dict:
+    """Running totals for the output metadata and breakdown report."""
+    return {
+        "categories": Counter(),
+        "podcasts": Counter(),
+        "nugget_types": Counter(),
+        "spicy_ratings": Counter(),
+        "characteristics": set(),
+        "guests": set(),
+        "with_hook": 0,
+    }
+
+
+def merge_insight_stats(stats: dict, other: dict):
+    """Add other's totals into stats."""
+    for key, value in other.items():
+        if isinstance(value, int):
+            stats[key] += value
+        else:
+            stats[key].update(value)
+
+
+def process_analysis_file(filepath: Path, data: dict, challenge_jobs: list = None, run_ts: str = None,
+                          stats: dict = None) -> list[dict]:
     """
-    Process a single analysis JSON file and extract insights.
+    Build insight cards from a single parsed analysis JSON file.
     Supports both old format (top_5_takeaways) and new format (insights).
+    
+    Cards that should get an AI challenge scenario are appended to
+    challenge_jobs as (insight_card, takeaway, guest, summary) so the API
+    calls can be run together afterwards.
+    
+    run_ts is the generation timestamp stamped on every card as createdAt.
+    
+    stats (from new_insight_stats) is updated with this file's cards once
+    they have all been built, so no pass over all cards is needed later.
     """
     
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    if run_ts is None:
+        run_ts = datetime.now().isoformat()
     
     # Extract metadata
     metadata = extract_metadata_from_analysis(data, filepath.name)
@@ -186,6 +290,16 @@ def process_analysis_file(filepath: Path) -> list[dict]:
     print(f"  Podcast: {podcast}")
     print(f"  Category: {primary_category}")
     
+    # Support both old and new formats
+    # New format: "insights" array with 15-20 items
+    # Old format: "top_5_takeaways" array with 5 items
+    takeaways = data.get("insights", data.get("top_5_takeaways", []))
+    
+    print(f"  Found {len(takeaways)} insights")
+    
+    if not takeaways:
+        return []
+    
     insights = []
     
     # Get episode-level metadata
@@ -194,12 +308,26 @@ def process_analysis_file(filepath: Path) -> list[dict]:
     characteristics = data.get("characteristics", [])
     summary = data.get("summary", "")
     
-    # Support both old and new formats
-    # New format: "insights" array with 15-20 items
-    # Old format: "top_5_takeaways" array with 5 items
-    takeaways = data.get("insights", data.get("top_5_takeaways", []))
+    # Episode-level subdicts are identical for every card, so build them once
+    # and share them by reference (cards are only serialized, never mutated)
+    card_scores = {
+        "freshness": scores.get("freshness", 5),
+        "insightDensity": scores.get("insight_density", 5),
+        "contrarian": scores.get("contrarian_index", 5),
+        "actionability": scores.get("actionability", 5)
+    }
+    card_verdict = {
+        "bestQuote": verdict.get("best_quote", ""),
+        "bestFor": verdict.get("best_for", ""),
+        "skipIf": verdict.get("skip_if", ""),
+        "tldr": verdict.get("tldr", "")
+    }
     
-    print(f"  Found {len(takeaways)} insights")
+    card_ids = new_card_ids(len(takeaways))
+    
+    file_stats = new_insight_stats()
+    file_stats["characteristics"].update(characteristics)
+    file_stats["guests"].add(guest)
     
     for i, takeaway in enumerate(takeaways):
         # Get category for this insight (new format) or use episode-level (old format)
@@ -212,7 +340,7 @@ def process_analysis_file(filepath: Path) -> list[dict]:
             obviousness_to_spicy(takeaway.get("obviousness_level", "moderately_non_obvious")))
         
         insight_card = {
-            "id": str(uuid.uuid4()),
+            "id": card_ids[i],
             "podcastTitle": podcast,
             "episodeTitle": episode_title,
             "guest": guest,
@@ -236,18 +364,8 @@ def process_analysis_file(filepath: Path) -> list[dict]:
             # Rich metadata
             "sourceFile": filepath.name,
             "characteristics": characteristics,
-            "scores": {
-                "freshness": scores.get("freshness", 5),
-                "insightDensity": scores.get("insight_density", 5),
-                "contrarian": scores.get("contrarian_index", 5),
-                "actionability": scores.get("actionability", 5)
-            },
-            "verdict": {
-                "bestQuote": verdict.get("best_quote", ""),
-                "bestFor": verdict.get("best_for", ""),
-                "skipIf": verdict.get("skip_if", ""),
-                "tldr": verdict.get("tldr", "")
-            },
+            "scores": card_scores,
+            "verdict": card_verdict,
             
             # Actionability from new format
             "actionabilityType": takeaway.get("actionability", "strategic"),
@@ -274,23 +392,134 @@ def process_analysis_file(filepath: Path) -> list[dict]:
             "challenge": None,
             
             # Metadata
-            "createdAt": datetime.now().isoformat(),
+            "createdAt": run_ts,
             "isPinned": False,
             "isSaved": False
         }
         
-        # Generate challenge scenario for top-ranked insights only
-        if GENERATE_AI_CHALLENGES and takeaway.get("rank", i + 1) <= 5:
-            print(f"    Generating challenge for insight {i+1}...")
-            challenge = generate_challenge_scenario(takeaway, guest, summary)
-            if challenge:
-                insight_card["challenge"] = challenge
+        # Queue challenge scenario generation for top-ranked insights only
+        if GENERATE_AI_CHALLENGES and challenge_jobs is not None and takeaway.get("rank", i + 1) <= 5:
+            challenge_jobs.append((insight_card, takeaway, guest, summary))
         
         insights.append(insight_card)
+        
+        file_stats["categories"][insight_category] += 1
+        file_stats["podcasts"][podcast] += 1
+        file_stats["nugget_types"][insight_card["nuggetType"]] += 1
+        file_stats["spicy_ratings"][spicy_rating] += 1
+        if insight_card["learningHook"]:
+            file_stats["with_hook"] += 1
+    
+    if stats is not None:
+        merge_insight_stats(stats, file_stats)
     
     return insights
 
 
+def generate_challenges_batch(challenge_jobs: list) -> int:
+    """
+    Generate challenge scenarios through the OpenAI Batch API: one JSONL
+    upload, poll until the batch finishes, then attach results by card id.
+    Returns the number of challenges attached.
+    """
+    batch_requests = [
+        json.dumps({
+            "custom_id": insight_card["id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": CHALLENGE_MODEL,
+                "max_tokens": 500,
+                "temperature": 0.7,
+                "messages": [{"role": "user", "content": build_challenge_prompt(takeaway, guest, summary)}]
+            }
+        })
+        for insight_card, takeaway, guest, summary in challenge_jobs
+    ]
+    cards_by_id = {job[0]["id"]: job[0] for job in challenge_jobs}
+    
+    try:
+        batch_file = client.files.create(
+            file=("challenges.jsonl", "\n".join(batch_requests).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"  Submitted batch {batch.id}, polling every {BATCH_POLL_SECONDS}s...")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(BATCH_POLL_SECONDS)
+            batch = client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts:
+                print(f"  Batch {batch.status}: {counts.completed}/{counts.total} done")
+        
+        # Expired batches can still carry partial results
+        if not batch.output_file_id:
+            print(f"    Warning: Batch {batch.id} ended as '{batch.status}' with no results")
+            return 0
+        
+        output = client.files.content(batch.output_file_id).text
+    except Exception as e:
+        print(f"    Warning: Could not run challenge batch: {e}")
+        return 0
+    
+    attached = 0
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = json.loads(line)
+            content = result["response"]["body"]["choices"][0]["message"]["content"]
+            challenge = parse_challenge_response(content)
+        except Exception as e:
+            print(f"    Warning: Could not parse challenge scenario: {e}")
+            continue
+        if challenge:
+            cards_by_id[result["custom_id"]]["challenge"] = challenge
+            attached += 1
+    
+    return attached
+
+
+def generate_challenges(challenge_jobs: list) -> int:
+    """
+    Generate challenge scenarios for queued cards concurrently and attach them.
+    Returns the number of challenges attached.
+    """
+    if not challenge_jobs:
+        return 0
+    
+    print(f"Generating {len(challenge_jobs)} challenge scenarios...")
+    
+    if USE_BATCH_API:
+        attached = generate_challenges_batch(challenge_jobs)
+        print()
+        return attached
+    
+    try:
+        challenges = asyncio.run(run_challenge_jobs(challenge_jobs))
+    except ImportError:
+        # Older openai packages have no AsyncOpenAI; fall back to threads
+        with ThreadPoolExecutor(max_workers=CHALLENGE_WORKERS) as executor:
+            challenges = list(executor.map(
+                lambda job: generate_challenge_scenario(job[1], job[2], job[3]),
+                challenge_jobs
+            ))
+    
+    attached = 0
+    for (insight_card, _, _, _), challenge in zip(challenge_jobs, challenges):
+        if challenge:
+            insight_card["challenge"] = challenge
+            attached += 1
+    
+    print()
+    return attached
+
+
 def main():
     """Main function to process all analysis files."""
     
@@ -304,10 +533,20 @@ def main():
     print(f"\nFound {len(analysis_files)} analysis files\n")
     
     all_insights = []
+    challenge_jobs = []
+    stats = new_insight_stats()
+    
+    # One timestamp for the whole generation run
+    run_ts = datetime.now().isoformat()
+    
+    # Phase 1: read + parse all files concurrently
+    sorted_files = sorted(analysis_files)
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        load_futures = [executor.submit(read_json, filepath) for filepath in sorted_files]
     
-    for filepath in sorted(analysis_files):
+    for filepath, future in zip(sorted_files, load_futures):
         try:
-            insights = process_analysis_file(filepath)
+            insights = process_analysis_file(filepath, future.result(), challenge_jobs, run_ts, stats)
             all_insights.extend(insights)
             print(f"  ✓ Added {len(insights)} insights\n")
         except Exception as e:
@@ -315,33 +554,33 @@ def main():
             import traceback
             traceback.print_exc()
     
-    # Collect unique values for metadata
-    all_categories = list(set(i.get("category", "learn_from_legends") for i in all_insights))
-    all_characteristics = list(set(
-        char for insight in all_insights 
-        for char in insight.get("characteristics", [])
-    ))
-    all_guests = list(set(i["guest"] for i in all_insights))
-    all_podcasts = list(set(i["podcastTitle"] for i in all_insights))
+    # Phase 2: challenge scenario API calls, all in flight together
+    with_challenge = generate_challenges(challenge_jobs)
+    
+    # Metadata and breakdowns come straight from the running totals
+    category_counts = stats["categories"]
+    podcast_counts = stats["podcasts"]
+    type_counts = stats["nugget_types"]
+    spicy_counts = stats["spicy_ratings"]
+    with_hook = stats["with_hook"]
     
     # Create output structure
     output = {
         "version": "2.0",
-        "generatedAt": datetime.now().isoformat(),
+        "generatedAt": run_ts,
         "totalInsights": len(all_insights),
         "insights": all_insights,
         "metadata": {
             "sources": len(analysis_files),
-            "categories": all_categories,
-            "characteristics": all_characteristics,
-            "guests": all_guests,
-            "podcasts": all_podcasts
+            "categories": sorted(category_counts),
+            "characteristics": sorted(stats["characteristics"]),
+            "guests": sorted(stats["guests"]),
+            "podcasts": sorted(podcast_counts)
         }
     }
     
     # Write output
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    write_json(OUTPUT_FILE, output)
     
     print("=" * 60)
     print(f"✓ Generated {len(all_insights)} insight cards from {len(analysis_files)} episodes")
@@ -350,11 +589,6 @@ def main():
     
     # Print category breakdown
     print("\n📁 CATEGORY BREAKDOWN:")
-    category_counts = {}
-    for insight in all_insights:
-        cat = insight.get("category", "learn_from_legends")
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-    
     category_icons = {
         "learn_from_legends": "🏆",
         "build_ai_products": "🤖",
@@ -368,11 +602,6 @@ def main():
     
     # Print podcast breakdown
     print("\n🎙️ PODCAST BREAKDOWN:")
-    podcast_counts = {}
-    for insight in all_insights:
-        pod = insight.get("podcastTitle", "Unknown")
-        podcast_counts[pod] = podcast_counts.get(pod, 0) + 1
-    
     for pod, count in sorted(podcast_counts.items(), key=lambda x: -x[1]):
         print(f"  • {pod}: {count} insights")
     
@@ -385,10 +614,6 @@ def main():
         "actionable": "⚡",
         "reinforcement": "💡"
     }
-    type_counts = {}
-    for insight in all_insights:
-        ntype = insight.get("nuggetType", "technical")
-        type_counts[ntype] = type_counts.get(ntype, 0) + 1
     
     for ntype, count in sorted(type_counts.items(), key=lambda x: -x[1]):
         icon = type_icons.get(ntype, "📝")
@@ -397,17 +622,15 @@ def main():
     # Print spicy ratings
     print("\n🔥 SPICY RATINGS:")
     for rating in [5, 4, 3, 2, 1]:
-        count = sum(1 for i in all_insights if i.get("spicyRating", 0) == rating)
+        count = spicy_counts[rating]
         if count > 0:
             emoji = "🔥" * rating
             print(f"  {emoji}: {count} insights")
     
     # Learning hooks
-    with_hook = sum(1 for i in all_insights if i.get("learningHook"))
     print(f"\n🎓 LEARNING HOOKS: {with_hook}/{len(all_insights)} insights")
     
     # Challenge scenarios
-    with_challenge = sum(1 for i in all_insights if i.get("challenge"))
     print(f"🎯 CHALLENGE SCENARIOS: {with_challenge}/{len(all_insights)} insights")
     
     print("\n✅ Done! Copy productreps_insights.json to your Xcode project Resources folder.")
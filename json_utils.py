@@ -0,0 +1,49 @@
+"""
+JSON file helpers shared by the batch scripts
+"""
+
+import json
+import os
+from functools import lru_cache
+
+# orjson parses/serializes several times faster than stdlib json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_json(path):
+    """Load a JSON file (orjson when available)"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_json(path, obj):
+    """Write obj as indented JSON (orjson when available)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        # 1MB buffer: far fewer write syscalls for multi-MB outputs
+        with open(path, 'w', buffering=1 << 20) as f:
+            json.dump(obj, f, indent=2)
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path, mtime_ns):
+    return read_json(path)
+
+
+def load_json_cached(path):
+    """
+    Load a JSON file, reusing the parsed result until the file's mtime changes.
+    The same object is returned to every caller, so treat it as read-only
+    (copy anything you hand out or modify). Only worth it for files re-read
+    many times in one process, like transcripts_metadata.json; use read_json
+    for files read once.
+    """
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
@@ -3,18 +3,21 @@ Pre-analyze all podcasts and cache results
 """
 
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from analyzer_llm import analyze_podcast, load_metadata
+from json_utils import write_json
+
+MAX_WORKERS = 8  # Podcasts analyzed at once
 
 def get_all_podcast_ids():
     """Get list of all podcast IDs"""
     podcast_ids = []
     
     if os.path.exists('transcripts'):
-        for filename in os.listdir('transcripts'):
-            if filename.endswith('.txt'):
-                podcast_id = filename.replace('.txt', '')
-                podcast_ids.append(podcast_id)
+        with os.scandir('transcripts') as entries:
+            for entry in entries:
+                if entry.name.endswith('.txt') and entry.is_file():
+                    podcast_ids.append(entry.name[:-len('.txt')])
     
     return sorted(podcast_ids)
 
@@ -29,23 +32,28 @@ def pre_analyze_all(force_reanalyze=False):
     
     results_summary = []
     
-    for i, podcast_id in enumerate(podcast_ids, 1):
-        print(f"\n[{i}/{len(podcast_ids)}] Processing: {podcast_id}")
+    def analyze_one(podcast_id):
+        result = analyze_podcast(podcast_id, use_cache=not force_reanalyze)
+        
+        metadata = load_metadata(podcast_id)
+        return {
+            "podcast_id": podcast_id,
+            "title": metadata.get("title", podcast_id),
+            "freshness_score": result["freshness_score"],
+            "insight_score": result["insight_score"],
+            "characteristics": result.get("characteristics", [])
+        }
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(analyze_one, podcast_id): podcast_id for podcast_id in podcast_ids}
         
-        try:
-            result = analyze_podcast(podcast_id, use_cache=not force_reanalyze)
-            
-            metadata = load_metadata(podcast_id)
-            results_summary.append({
-                "podcast_id": podcast_id,
-                "title": metadata.get("title", podcast_id),
-                "freshness_score": result["freshness_score"],
-                "insight_score": result["insight_score"],
-                "characteristics": result.get("characteristics", [])
-            })
-            
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+        for i, future in enumerate(as_completed(futures), 1):
+            podcast_id = futures[future]
+            print(f"\n[{i}/{len(podcast_ids)}] Processed: {podcast_id}")
+            try:
+                results_summary.append(future.result())
+            except Exception as e:
+                print(f"  ✗ [{podcast_id}] Error: {e}")
     
     # Sort by insight score
     results_summary.sort(key=lambda x: x.get("insight_score", 0), reverse=True)
@@ -59,8 +67,7 @@ def pre_analyze_all(force_reanalyze=False):
     
     # Save summary
     os.makedirs('cache', exist_ok=True)
-    with open('cache/analysis_summary.json', 'w') as f:
-        json.dump(results_summary, f, indent=2)
+    write_json('cache/analysis_summary.json', results_summary)
     
     print(f"Total analyzed: {len(podcast_ids)}")
 
@@ -1,13 +1,97 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import hashlib
 import os
+import stat
 
 os.chdir('static')
 
+# {absolute path: (content, etag, mtime)} for static files, re-read when
+# a file's mtime changes so edits show up on the next reload
+STATIC_CACHE = {}
+# Larger files aren't held in memory; they're streamed with sendfile instead
+STATIC_CACHE_MAX_BYTES = 1024 * 1024
+
+
+def read_static_entry(path, mtime):
+    """Read a file into STATIC_CACHE and return its entry"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    etag = '"%s"' % hashlib.md5(data).hexdigest()
+    STATIC_CACHE[path] = (data, etag, mtime)
+    return STATIC_CACHE[path]
+
+
+def get_static_entry(path):
+    """Current STATIC_CACHE entry for path (reloaded if modified); None if not a small file"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        STATIC_CACHE.pop(path, None)
+        return None
+    if not stat.S_ISREG(st.st_mode) or st.st_size > STATIC_CACHE_MAX_BYTES:
+        STATIC_CACHE.pop(path, None)
+        return None
+
+    entry = STATIC_CACHE.get(path)
+    if entry is None or entry[2] != st.st_mtime:
+        try:
+            entry = read_static_entry(path, st.st_mtime)
+        except OSError:
+            return None
+    return entry
+
+
+def load_static_cache():
+    """Read every small file under the current directory into STATIC_CACHE"""
+    for root, _, files in os.walk('.'):
+        for name in files:
+            get_static_entry(os.path.abspath(os.path.join(root, name)))
+
+
 class MyHandler(SimpleHTTPRequestHandler):
-    def end_headers(self):
-        self.send_header('Content-Type', 'text/html')
-        super().end_headers()
+    def do_GET(self):
+        if not self.send_cached(include_body=True):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.send_cached(include_body=False):
+            super().do_HEAD()
+
+    def send_cached(self, include_body):
+        """Answer from STATIC_CACHE (304 if the ETag matches); False if not a cached file"""
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?', 1)[0].endswith('/'):
+            path = os.path.join(path, 'index.html')
+        entry = get_static_entry(os.path.abspath(path))
+        if entry is None:
+            return False
+
+        data, etag, mtime = entry
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return True
+
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(mtime))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(data)
+        return True
+
+    def copyfile(self, source, outputfile):
+        # socket.sendfile uses os.sendfile (no userspace copy) and falls
+        # back to plain sends where that isn't supported
+        if outputfile is self.wfile:
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
 
-server = HTTPServer(('localhost', 8001), MyHandler)
+load_static_cache()
+server = ThreadingHTTPServer(('localhost', 8001), MyHandler)
 print("Test server running at http://localhost:8001")
 server.serve_forever()